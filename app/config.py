@@ -23,6 +23,40 @@ class Settings(BaseSettings):
     odoo_user: str = "hello@unipack.asia"
     odoo_api_key: str = "8452eb0dc0dc4a3e1bcf8aae9c5cce53b0cd41f4"
     
+    # Odoo concurrency budget (shared by all uvicorn workers on this host)
+    odoo_max_concurrency: int = 10
+    odoo_priority_slots: int = 2
+    odoo_budget_dir: str = "/tmp/unipack-odoo-budget"
+    odoo_budget_timeout: float = 30.0
+    
+    # Request deadlines (seconds); clients may override via X-Request-Timeout.
+    # Defaults sit just under nginx's 60s proxy_read_timeout.
+    batch_deadline_seconds: float = 55.0
+    import_deadline_seconds: float = 55.0
+    max_deadline_seconds: float = 600.0
+    
+    # Cached category/tax ids used to pre-validate rows (seconds)
+    reference_cache_ttl: float = 300.0
+    # Incremental (write_date) refresh interval of the category path index
+    category_refresh_seconds: float = 60.0
+    
+    # Cross-request upsert micro-batching (opt-in)
+    upsert_batching_enabled: bool = False
+    upsert_batch_window_ms: float = 5.0
+    upsert_batch_max_rows: int = 50
+    
+    # CSV/XLSX import: rows validated and upserted per chunk
+    import_chunk_size: int = 200
+    
+    # NocoDB webhook sync: tables matched by id, or by any of the comma-separated
+    # titles (case-insensitive); add-table-links.js renames Products/Contacts
+    nocodb_product_table: str = "Product Master,Products"
+    nocodb_customer_table: str = "Contact Master,Contacts"
+    nocodb_product_table_id: str = ""
+    nocodb_customer_table_id: str = ""
+    webhook_debounce_ms: float = 1500.0
+    webhook_max_delay_ms: float = 10000.0
+    
     # Gemini AI
     gemini_api_key: str = ""
     
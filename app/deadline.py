@@ -0,0 +1,112 @@
+"""
+Request deadlines
+
+A deadline comes from the X-Request-Timeout header (seconds) or the route's
+default and is bound to the worker thread processing each row, so Odoo and
+Gemini calls can size their timeouts from it. Rows that have not started by
+the time the deadline passes (or the client disconnects) are skipped.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from fastapi import Header, Request
+
+from .config import get_settings
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is attempted after its request deadline"""
+
+
+class Deadline:
+    """Absolute deadline for one request"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.disconnected = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.disconnected or time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if no more work should be started"""
+        if self.disconnected:
+            raise DeadlineExceeded("Client disconnected")
+        if self.expired:
+            raise DeadlineExceeded(f"Request deadline of {self.timeout:.1f}s exceeded")
+
+    def skipped_result(self) -> dict:
+        """Row result for work dropped before it started"""
+        reason = "client disconnected" if self.disconnected else "request deadline exceeded"
+        return {"success": False, "id": None, "message": f"Skipped: {reason}", "skipped": True}
+
+
+# ============== Thread binding ==============
+
+_local = threading.local()
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request this thread is working for, if any"""
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def bind_deadline(deadline: Optional[Deadline]):
+    """Make `deadline` visible to Odoo/Gemini calls made by this thread"""
+    previous = current_deadline()
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+
+# ============== Dependency ==============
+
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+async def _watch_disconnect(request: Request, deadline: Deadline) -> None:
+    while not deadline.expired:
+        if await request.is_disconnected():
+            deadline.disconnected = True
+            return
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+def request_deadline(default_setting: str) -> Callable:
+    """
+    Dependency factory: Depends(request_deadline("batch_deadline_seconds"))
+
+    The client header may shorten or extend the route default, up to
+    max_deadline_seconds.
+    """
+    async def dependency(
+        request: Request,
+        x_request_timeout: Optional[float] = Header(None, alias=DEADLINE_HEADER),
+    ):
+        settings = get_settings()
+        timeout = getattr(settings, default_setting)
+        if x_request_timeout is not None and x_request_timeout > 0:
+            timeout = x_request_timeout
+        deadline = Deadline(min(timeout, settings.max_deadline_seconds))
+
+        watcher = asyncio.create_task(_watch_disconnect(request, deadline))
+        try:
+            yield deadline
+        finally:
+            watcher.cancel()
+
+    return dependency
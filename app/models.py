@@ -14,6 +14,7 @@ class Product(BaseModel):
     product_code: Optional[str] = ""
     product_name: str
     category_id: Optional[int] = 1
+    category: Optional[str] = None  # path or name, e.g. "All / Machinery"; overrides category_id
     sales_price: Optional[float] = 0
     cost: Optional[float] = 0
     description: Optional[str] = ""
@@ -25,6 +26,7 @@ class ProductBatchRequest(BaseModel):
     """Batch product creation request"""
     products: List[Product]
     generate_ai_content: bool = False
+    create_missing_categories: bool = False
 
 
 class ProductResult(BaseModel):
@@ -32,12 +34,14 @@ class ProductResult(BaseModel):
     success: bool
     id: Optional[int] = None
     message: str
+    skipped: bool = False
 
 
 class ProductBatchResponse(BaseModel):
     """Batch product response"""
     success: bool
     results: List[ProductResult]
+    skipped_expired: int = 0
 
 
 # ============== Customer Models ==============
@@ -69,12 +73,60 @@ class CustomerResult(BaseModel):
     success: bool
     id: Optional[int] = None
     message: str
+    skipped: bool = False
 
 
 class CustomerBatchResponse(BaseModel):
     """Batch customer response"""
     success: bool
     results: List[CustomerResult]
+    skipped_expired: int = 0
+
+
+# ============== Import Models ==============
+
+class ImportRowResult(BaseModel):
+    """Result for one row of an imported file"""
+    row: int
+    success: bool
+    id: Optional[int] = None
+    message: str
+    skipped: bool = False
+
+
+class ImportResponse(BaseModel):
+    """CSV/XLSX import report"""
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    skipped_expired: int = 0
+    error: Optional[str] = None  # set when the file could not be read to the end
+    results: List[ImportRowResult]
+
+
+# ============== Webhook Models ==============
+
+class NocoDBWebhookData(BaseModel):
+    """Payload of a NocoDB records.* webhook"""
+    table_id: Optional[str] = ""
+    table_name: Optional[str] = ""
+    rows: List[dict] = []
+
+
+class NocoDBWebhookEvent(BaseModel):
+    """NocoDB webhook event (records.after.insert/update/delete, bulk variants)"""
+    type: str
+    id: Optional[str] = None
+    data: NocoDBWebhookData
+
+
+class WebhookResponse(BaseModel):
+    """Webhook acknowledgement; rows are synced after the debounce window"""
+    success: bool
+    accepted: int
+    ignored: int
+    pending: int
 
 
 # ============== Reference Data Models ==============
@@ -141,6 +193,21 @@ class AIGenerateDescriptionResponse(BaseModel):
     description: str
 
 
+# ============== Odoo Budget ==============
+
+class OdooBudgetResponse(BaseModel):
+    """Odoo concurrency budget utilization"""
+    success: bool
+    scope: str
+    total_slots: int
+    priority_slots: int
+    in_use: int
+    priority_in_use: int
+    utilization: float
+    process_in_flight: dict
+    process_timeouts: int
+
+
 # ============== Health Check ==============
 
 class HealthResponse(BaseModel):
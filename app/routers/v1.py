@@ -3,31 +3,51 @@ API v1 Router - All endpoints (Parallel-safe version)
 Updated: 2026-01-10 - Added ThreadPoolExecutor for parallel processing
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from pydantic import ValidationError
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 import asyncio
+import json
 from concurrent.futures import ThreadPoolExecutor
 import logging
 
 from ..auth import verify_token
+from ..deadline import Deadline, DeadlineExceeded, bind_deadline, request_deadline
 from ..config import get_settings
 from ..models import (
-    HealthResponse,
+    HealthResponse, OdooBudgetResponse,
     CategoriesResponse, TaxesResponse, CountriesResponse,
-    ProductBatchRequest, ProductBatchResponse, ProductResult,
-    CustomerBatchRequest, CustomerBatchResponse, CustomerResult,
+    Product, ProductBatchRequest, ProductBatchResponse, ProductResult,
+    Customer, CustomerBatchRequest, CustomerBatchResponse, CustomerResult,
+    ImportRowResult, ImportResponse,
+    NocoDBWebhookData, NocoDBWebhookEvent, WebhookResponse,
     AIGenerateNameRequest, AIGenerateNameResponse,
     AIGenerateDescriptionRequest, AIGenerateDescriptionResponse,
 )
 from ..services.odoo_service import get_odoo_service
 from ..services.ai_service import get_ai_service
+from ..services.odoo_budget import get_odoo_budget, BULK
+from ..services.upsert_batcher import UpsertBatcher
+from ..services.validation import validate_products, validate_customers
+from ..services.import_service import (
+    ImportFormatError, open_records, map_record, take, PRODUCT_ALIASES, CUSTOMER_ALIASES,
+    PRODUCT_LINK_COLUMNS, CUSTOMER_LINK_COLUMNS,
+)
+from ..services.webhook_coalescer import SyncedVersions, WebhookCoalescer, WebhookEntry
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Thread pool for blocking Odoo operations (10 workers = 10 concurrent Odoo calls)
+# Thread pool for blocking Odoo operations. Total in-flight Odoo calls across
+# all uvicorn workers are capped separately by the shared OdooBudget.
 executor = ThreadPoolExecutor(max_workers=10)
 
+# Separate pool for interactive endpoints (health, reference data, AI), so they
+# never queue behind bulk rows waiting for a bulk-lane Odoo slot and can reach
+# the reserved priority slots while a batch is running.
+interactive_executor = ThreadPoolExecutor(max_workers=4)
+
 
 # ============== Health ==============
 
@@ -39,7 +59,7 @@ async def health_check():
         odoo = get_odoo_service()
         # Run blocking check in thread to not block event loop
         connected = await asyncio.get_event_loop().run_in_executor(
-            executor, odoo.check_connection
+            interactive_executor, odoo.check_connection
         )
         return HealthResponse(
             status="ok" if connected else "error",
@@ -55,6 +75,16 @@ async def health_check():
         )
 
 
+@router.get("/odoo/budget", response_model=OdooBudgetResponse)
+async def odoo_budget_status(token: str = Depends(verify_token)):
+    """Odoo concurrency budget utilization across all workers"""
+    budget = get_odoo_budget()
+    status = await asyncio.get_event_loop().run_in_executor(
+        interactive_executor, budget.status
+    )
+    return OdooBudgetResponse(success=True, **status)
+
+
 # ============== Reference Data ==============
 
 @router.get("/reference/categories", response_model=CategoriesResponse)
@@ -62,7 +92,7 @@ async def get_categories(token: str = Depends(verify_token)):
     """Get product categories from Odoo"""
     odoo = get_odoo_service()
     categories = await asyncio.get_event_loop().run_in_executor(
-        executor, odoo.get_categories
+        interactive_executor, odoo.get_categories
     )
     return CategoriesResponse(success=True, categories=categories)
 
@@ -72,7 +102,7 @@ async def get_taxes(token: str = Depends(verify_token)):
     """Get sales taxes from Odoo"""
     odoo = get_odoo_service()
     taxes = await asyncio.get_event_loop().run_in_executor(
-        executor, odoo.get_taxes
+        interactive_executor, odoo.get_taxes
     )
     return TaxesResponse(success=True, taxes=taxes)
 
@@ -82,106 +112,493 @@ async def get_countries(token: str = Depends(verify_token)):
     """Get countries from Odoo"""
     odoo = get_odoo_service()
     countries = await asyncio.get_event_loop().run_in_executor(
-        executor, odoo.get_countries
+        interactive_executor, odoo.get_countries
     )
     return CountriesResponse(success=True, countries=countries)
 
 
 # ============== Products ==============
 
-def _process_single_product(product_data: dict, generate_ai: bool = False) -> dict:
-    """Process a single product (runs in thread pool)"""
-    odoo = get_odoo_service()
+def _prepare_product(
+    product_data: dict, generate_ai: bool = False, deadline: Optional[Deadline] = None
+) -> dict:
+    """Fill in AI-generated fields for a product (runs in thread pool)"""
     ai = get_ai_service()
 
     data = product_data
 
     # Optional AI content generation
-    if generate_ai and ai.is_available:
+    if generate_ai and ai.is_available and not (deadline and deadline.expired):
         if not data.get('product_name') and data.get('product_code'):
-            data['product_name'] = ai.generate_product_name(
-                data['product_code'],
-                data.get('machine_name', 'Machine'),
-                data.get('size', 'Standard')
-            )
+            with bind_deadline(deadline):
+                data['product_name'] = ai.generate_product_name(
+                    data['product_code'],
+                    data.get('machine_name', 'Machine'),
+                    data.get('size', 'Standard')
+                )
 
-    return odoo.create_or_update_product(data)
+    return data
 
 
-@router.post("/products/batch", response_model=ProductBatchResponse)
-async def batch_create_products(
-    request: ProductBatchRequest,
-    token: str = Depends(verify_token)
-):
-    """Batch create/update products in Odoo (parallel processing)"""
-    loop = asyncio.get_event_loop()
+def _cut_short(deadline: Deadline, error: DeadlineExceeded, started: bool) -> dict:
+    """Result for rows whose deadline passed while they waited on Odoo"""
+    # Nothing was sent for the row yet, so it is safe to retry later
+    if not started:
+        return deadline.skipped_result()
+    return {"success": False, "id": None, "message": str(error)}
 
-    # Process all products in parallel using thread pool
-    tasks = [
-        loop.run_in_executor(
-            executor,
-            _process_single_product,
-            product.model_dump(),
-            request.generate_ai_content
-        )
-        for product in request.products
+
+def _process_single_product(
+    product_data: dict, generate_ai: bool = False, deadline: Optional[Deadline] = None
+) -> dict:
+    """Process a single product (runs in thread pool, bulk Odoo lane)"""
+    # Queued rows whose caller has given up are dropped before they start
+    if deadline is not None and deadline.expired:
+        return deadline.skipped_result()
+
+    odoo = get_odoo_service()
+    data = _prepare_product(product_data, generate_ai, deadline)
+
+    with bind_deadline(deadline), get_odoo_budget().lane(BULK):
+        sent = odoo.rpc_count
+        try:
+            return odoo.create_or_update_product(data)
+        except DeadlineExceeded as e:
+            return _cut_short(deadline, e, odoo.rpc_count > sent)
+
+
+def _bulk_upsert_products(rows: List[dict], deadline: Optional[Deadline] = None) -> List[dict]:
+    """Flush a micro-batch of products (runs in thread pool, bulk Odoo lane)"""
+    odoo = get_odoo_service()
+    with bind_deadline(deadline), get_odoo_budget().lane(BULK):
+        sent = odoo.rpc_count
+        try:
+            return odoo.bulk_upsert_products(rows)
+        except DeadlineExceeded as e:
+            return [_cut_short(deadline, e, odoo.rpc_count > sent)] * len(rows)
+
+
+# Opt-in micro-batching of rows from concurrent requests (UPSERT_BATCHING_ENABLED)
+product_batcher = UpsertBatcher(
+    "products", _bulk_upsert_products, executor,
+    get_settings().upsert_batch_window_ms, get_settings().upsert_batch_max_rows
+)
+
+
+def _validate_products(rows: List[dict], create_missing_categories: bool = False) -> list:
+    """Validate product rows (runs in thread pool, bulk Odoo lane)"""
+    # Cache/index refreshes and category creation must not take the interactive slots
+    with get_odoo_budget().lane(BULK):
+        return validate_products(rows, create_missing_categories)
+
+
+def _merge_validation(errors: List[Optional[str]], clean_results: list) -> list:
+    """Interleave instant failures for invalid rows with results for clean rows"""
+    clean = iter(clean_results)
+    return [
+        next(clean) if error is None
+        else {"success": False, "id": None, "message": f"Validation failed: {error}"}
+        for error in errors
     ]
 
-    # Wait for all to complete
-    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
 
+def _to_results(raw_results: list, result_cls) -> list:
     results = []
     for r in raw_results:
         if isinstance(r, Exception):
-            results.append(ProductResult(success=False, id=None, message=str(r)))
+            results.append(result_cls(success=False, id=None, message=str(r)))
         else:
-            results.append(ProductResult(**r))
+            results.append(result_cls(**r))
+    return results
+
+
+async def _upsert_products(
+    rows: List[dict], generate_ai: bool = False, deadline: Optional[Deadline] = None,
+    bulk: bool = False, create_missing_categories: bool = False
+) -> List[ProductResult]:
+    """Run product rows through the upsert pipeline (bulk=True forces bulk flushes)"""
+    loop = asyncio.get_event_loop()
+
+    if deadline is not None and deadline.expired:
+        return _to_results([deadline.skipped_result() for _ in rows], ProductResult)
+
+    # Category paths are resolved and rows validated locally; only clean rows reach Odoo
+    errors = await loop.run_in_executor(
+        executor, _validate_products, rows, create_missing_categories
+    )
+    rows = [row for row, error in zip(rows, errors) if error is None]
+
+    if not rows:
+        raw_results = []
+    elif bulk or get_settings().upsert_batching_enabled:
+        if generate_ai and get_ai_service().is_available:
+            rows = await asyncio.gather(*[
+                loop.run_in_executor(executor, _prepare_product, row, generate_ai, deadline)
+                for row in rows
+            ])
+        raw_results = await product_batcher.submit_many(rows, deadline)
+    else:
+        # Process all products in parallel using thread pool
+        tasks = [
+            loop.run_in_executor(executor, _process_single_product, row, generate_ai, deadline)
+            for row in rows
+        ]
+        raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    return _to_results(_merge_validation(errors, raw_results), ProductResult)
+
+
+@router.post("/products/batch", response_model=ProductBatchResponse)
+async def batch_create_products(
+    request: ProductBatchRequest,
+    token: str = Depends(verify_token),
+    deadline: Deadline = Depends(request_deadline("batch_deadline_seconds"))
+):
+    """Batch create/update products in Odoo (parallel processing)"""
+    results = await _upsert_products(
+        [product.model_dump() for product in request.products],
+        request.generate_ai_content,
+        deadline,
+        create_missing_categories=request.create_missing_categories
+    )
 
     return ProductBatchResponse(
         success=all(r.success for r in results),
-        results=results
+        results=results,
+        skipped_expired=sum(r.skipped for r in results)
     )
 
 
 # ============== Customers ==============
 
-def _process_single_customer(customer_data: dict) -> dict:
-    """Process a single customer (runs in thread pool)"""
+def _process_single_customer(customer_data: dict, deadline: Optional[Deadline] = None) -> dict:
+    """Process a single customer (runs in thread pool, bulk Odoo lane)"""
+    # Queued rows whose caller has given up are dropped before they start
+    if deadline is not None and deadline.expired:
+        return deadline.skipped_result()
+
     odoo = get_odoo_service()
-    return odoo.create_or_update_customer(customer_data)
+    with bind_deadline(deadline), get_odoo_budget().lane(BULK):
+        sent = odoo.rpc_count
+        try:
+            return odoo.create_or_update_customer(customer_data)
+        except DeadlineExceeded as e:
+            return _cut_short(deadline, e, odoo.rpc_count > sent)
+
+
+def _bulk_upsert_customers(rows: List[dict], deadline: Optional[Deadline] = None) -> List[dict]:
+    """Flush a micro-batch of customers (runs in thread pool, bulk Odoo lane)"""
+    odoo = get_odoo_service()
+    with bind_deadline(deadline), get_odoo_budget().lane(BULK):
+        sent = odoo.rpc_count
+        try:
+            return odoo.bulk_upsert_customers(rows)
+        except DeadlineExceeded as e:
+            return [_cut_short(deadline, e, odoo.rpc_count > sent)] * len(rows)
+
+
+customer_batcher = UpsertBatcher(
+    "customers", _bulk_upsert_customers, executor,
+    get_settings().upsert_batch_window_ms, get_settings().upsert_batch_max_rows
+)
+
+
+async def _upsert_customers(
+    rows: List[dict], deadline: Optional[Deadline] = None, bulk: bool = False
+) -> List[CustomerResult]:
+    """Run customer rows through the upsert pipeline (bulk=True forces bulk flushes)"""
+    loop = asyncio.get_event_loop()
+
+    if deadline is not None and deadline.expired:
+        return _to_results([deadline.skipped_result() for _ in rows], CustomerResult)
+
+    # Only rows that pass local validation reach Odoo
+    errors = validate_customers(rows)
+    rows = [row for row, error in zip(rows, errors) if error is None]
+
+    if not rows:
+        raw_results = []
+    elif bulk or get_settings().upsert_batching_enabled:
+        raw_results = await customer_batcher.submit_many(rows, deadline)
+    else:
+        # Process all customers in parallel using thread pool
+        tasks = [
+            loop.run_in_executor(executor, _process_single_customer, row, deadline)
+            for row in rows
+        ]
+        raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    return _to_results(_merge_validation(errors, raw_results), CustomerResult)
 
 
 @router.post("/customers/batch", response_model=CustomerBatchResponse)
 async def batch_create_customers(
     request: CustomerBatchRequest,
-    token: str = Depends(verify_token)
+    token: str = Depends(verify_token),
+    deadline: Deadline = Depends(request_deadline("batch_deadline_seconds"))
 ):
     """Batch create/update customers in Odoo (parallel processing)"""
+    results = await _upsert_customers(
+        [customer.model_dump() for customer in request.customers],
+        deadline
+    )
+
+    return CustomerBatchResponse(
+        success=all(r.success for r in results),
+        results=results,
+        skipped_expired=sum(r.skipped for r in results)
+    )
+
+
+# ============== File Import ==============
+
+async def _import_file(
+    file: UploadFile, column_map: Optional[str], model_cls, aliases: dict, upsert,
+    deadline: Deadline
+) -> ImportResponse:
+    """Stream rows out of an uploaded CSV/XLSX and upsert them chunk by chunk"""
+    try:
+        overrides = json.loads(column_map) if column_map else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid column_map JSON: {e}")
+    if overrides is not None and not isinstance(overrides, dict):
+        raise HTTPException(status_code=400, detail="column_map must be a JSON object")
+
     loop = asyncio.get_event_loop()
+    chunk_size = get_settings().import_chunk_size
 
-    # Process all customers in parallel using thread pool
-    tasks = [
-        loop.run_in_executor(
-            executor,
-            _process_single_customer,
-            customer.model_dump()
+    # File parsing is blocking; keep it off the event loop and out of the Odoo pool
+    try:
+        records = await loop.run_in_executor(
+            None, open_records,
+            file.file, file.filename, list(model_cls.model_fields), aliases, overrides
         )
-        for customer in request.customers
-    ]
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results: List[ImportRowResult] = []
+    error = None
+    while True:
+        try:
+            chunk = await loop.run_in_executor(None, take, records, chunk_size)
+        except ImportFormatError as e:
+            if not results:
+                raise HTTPException(status_code=400, detail=str(e))
+            # Earlier chunks are already in Odoo: report them along with the error
+            error = str(e)
+            break
+        if not chunk:
+            break
+
+        valid_rows, valid_data = [], []
+        for row_number, record in chunk:
+            try:
+                valid_data.append(model_cls(**record).model_dump())
+                valid_rows.append(row_number)
+            except ValidationError as e:
+                message = "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+                results.append(ImportRowResult(row=row_number, success=False, message=message))
+
+        for row_number, r in zip(valid_rows, await upsert(valid_data, deadline)):
+            results.append(ImportRowResult(row=row_number, **r.model_dump()))
+
+    results.sort(key=lambda r: r.row)
+    succeeded = sum(1 for r in results if r.success)
+    return ImportResponse(
+        success=error is None and succeeded == len(results),
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        skipped_expired=sum(r.skipped for r in results),
+        error=error,
+        results=results
+    )
 
-    # Wait for all to complete
-    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    results = []
-    for r in raw_results:
-        if isinstance(r, Exception):
-            results.append(CustomerResult(success=False, id=None, message=str(r)))
+@router.post("/products/import", response_model=ImportResponse)
+async def import_products(
+    file: UploadFile = File(...),
+    column_map: Optional[str] = Form(None),
+    generate_ai_content: bool = Form(False),
+    create_missing_categories: bool = Form(False),
+    token: str = Depends(verify_token),
+    deadline: Deadline = Depends(request_deadline("import_deadline_seconds"))
+):
+    """Import products from a CSV/XLSX upload (column_map: JSON {header: field})"""
+    async def upsert(rows, deadline):
+        return await _upsert_products(
+            rows, generate_ai_content, deadline,
+            create_missing_categories=create_missing_categories
+        )
+
+    return await _import_file(file, column_map, Product, PRODUCT_ALIASES, upsert, deadline)
+
+
+@router.post("/customers/import", response_model=ImportResponse)
+async def import_customers(
+    file: UploadFile = File(...),
+    column_map: Optional[str] = Form(None),
+    token: str = Depends(verify_token),
+    deadline: Deadline = Depends(request_deadline("import_deadline_seconds"))
+):
+    """Import customers from a CSV/XLSX upload (column_map: JSON {header: field})"""
+    return await _import_file(
+        file, column_map, Customer, CUSTOMER_ALIASES, _upsert_customers, deadline
+    )
+
+
+# ============== NocoDB Webhooks ==============
+
+# kind -> (model, header aliases, NocoDB Links columns, natural key field)
+WEBHOOK_MODELS = {
+    "products": (Product, PRODUCT_ALIASES, PRODUCT_LINK_COLUMNS, "product_code"),
+    "customers": (Customer, CUSTOMER_ALIASES, CUSTOMER_LINK_COLUMNS, "gst_number"),
+}
+
+# Last synced UpdatedAt per record, shared by the workers through the budget directory
+webhook_versions = SyncedVersions(get_odoo_budget().directory if get_odoo_budget().is_global else None)
+
+
+def _row_version(row: dict) -> Optional[datetime]:
+    """NocoDB's UpdatedAt as an aware datetime, None if missing or unparseable"""
+    value = row.get("UpdatedAt") or row.get("updated_at")
+    if not value:
+        return None
+    try:
+        version = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return version if version.tzinfo else version.replace(tzinfo=timezone.utc)
+
+
+def _sync_webhook_rows(kind: str, entries: List[WebhookEntry]) -> Tuple[int, List[dict]]:
+    """
+    Upsert coalesced NocoDB rows (runs in thread pool, bulk Odoo lane).
+    Flushes of one table kind are serialized across workers, and states older
+    than one already written are dropped. Returns (stale count, results).
+    """
+    model_cls = WEBHOOK_MODELS[kind][0]
+    with get_odoo_budget().host_lock(f"nocodb-{kind}-sync"):
+        synced = webhook_versions.load(kind)
+
+        fresh, rows = [], []
+        for key, record, version in entries:
+            last = synced.get(str(key))
+            if version is not None and last is not None and version <= last:
+                # Another flush (possibly on another worker) already wrote this or a newer state
+                continue
+            try:
+                # Only columns the row carries are written; unset fields keep their Odoo values
+                rows.append(model_cls(**record).model_dump(exclude_unset=True))
+            except ValidationError as e:
+                logger.warning(f"NocoDB {kind} row {key} skipped: {e}")
+                continue
+            fresh.append((key, version))
+
+        if kind == "products":
+            errors = _validate_products(rows)
+            upsert = _bulk_upsert_products
         else:
-            results.append(CustomerResult(**r))
+            errors = validate_customers(rows)
+            upsert = _bulk_upsert_customers
+        clean = [row for row, error in zip(rows, errors) if error is None]
+        results = _merge_validation(errors, upsert(clean) if clean else [])
 
-    return CustomerBatchResponse(
-        success=all(r.success for r in results),
-        results=results
+        for (key, version), result in zip(fresh, results):
+            if version is not None and result["success"]:
+                synced[str(key)] = version
+        webhook_versions.save(kind, synced)
+
+    return len(entries) - len(rows), results
+
+
+async def _flush_webhook(kind: str, entries: List[WebhookEntry]) -> None:
+    """Upsert the latest state of coalesced NocoDB rows in bulk"""
+    loop = asyncio.get_event_loop()
+    dropped, results = await loop.run_in_executor(executor, _sync_webhook_rows, kind, entries)
+
+    failed = [r["message"] for r in results if not r["success"]]
+    logger.info(
+        f"NocoDB sync: {len(results) - len(failed)}/{len(entries)} {kind} upserted"
+        f" ({dropped} stale or invalid)"
+    )
+    for message in failed:
+        logger.warning(f"NocoDB {kind} sync failed: {message}")
+
+
+webhook_coalescer = WebhookCoalescer(
+    _flush_webhook, get_settings().webhook_debounce_ms, get_settings().webhook_max_delay_ms
+)
+
+
+def _table_matches(table_id: str, table_name: str, configured_id: str, configured_names: str) -> bool:
+    if configured_id and table_id == configured_id:
+        return True
+    names = {n.strip().lower() for n in configured_names.split(",") if n.strip()}
+    return table_name.strip().lower() in names
+
+
+def _webhook_kind(data: NocoDBWebhookData) -> Optional[str]:
+    settings = get_settings()
+    table_id, table_name = data.table_id or "", data.table_name or ""
+    if _table_matches(table_id, table_name, settings.nocodb_product_table_id, settings.nocodb_product_table):
+        return "products"
+    if _table_matches(table_id, table_name, settings.nocodb_customer_table_id, settings.nocodb_customer_table):
+        return "customers"
+    return None
+
+
+def _webhook_action(event_type: str) -> Optional[str]:
+    """'records.after.bulkUpdate' -> 'update'; None for unsupported events"""
+    event_type = event_type.lower()
+    for action in ("insert", "update", "delete"):
+        if event_type.endswith(action):
+            return action
+    return None
+
+
+@router.post("/webhooks/nocodb", response_model=WebhookResponse)
+async def nocodb_webhook(
+    event: NocoDBWebhookEvent,
+    token: str = Depends(verify_token)
+):
+    """Receive NocoDB row changes; repeated edits of a row are coalesced before sync"""
+    action = _webhook_action(event.type)
+    if action is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported NocoDB event type '{event.type}'")
+    kind = _webhook_kind(event.data)
+
+    accepted = ignored = 0
+    for row in event.data.rows:
+        key = row.get("Id", row.get("ID", row.get("id")))
+        if kind is None or key is None:
+            ignored += 1
+        elif action == "delete":
+            # Deletions are not mirrored to Odoo, but stale pending edits are dropped
+            webhook_coalescer.discard(kind, key)
+            accepted += 1
+        else:
+            model_cls, aliases, links, key_field = WEBHOOK_MODELS[kind]
+            record = map_record(row, list(model_cls.model_fields), aliases, exclude=links)
+            if not record.get(key_field):
+                # Without a natural key every flush would create another Odoo record
+                ignored += 1
+                continue
+            webhook_coalescer.add(kind, key, record, _row_version(row))
+            accepted += 1
+
+    if kind is None and event.data.rows:
+        logger.warning(
+            f"NocoDB webhook for unknown table '{event.data.table_name}' ({event.data.table_id})"
+        )
+
+    return WebhookResponse(
+        success=accepted > 0 or not event.data.rows,
+        accepted=accepted,
+        ignored=ignored,
+        pending=webhook_coalescer.pending
     )
 
 
@@ -202,7 +619,7 @@ async def ai_generate_name(
             request.size
         )
 
-    name = await asyncio.get_event_loop().run_in_executor(executor, _generate)
+    name = await asyncio.get_event_loop().run_in_executor(interactive_executor, _generate)
     return AIGenerateNameResponse(success=True, name=name)
 
 
@@ -221,5 +638,5 @@ async def ai_generate_description(
             request.specifications
         )
 
-    description = await asyncio.get_event_loop().run_in_executor(executor, _generate)
+    description = await asyncio.get_event_loop().run_in_executor(interactive_executor, _generate)
     return AIGenerateDescriptionResponse(success=True, description=description)
@@ -1,5 +1,20 @@
 # Services package
 from .odoo_service import OdooService, get_odoo_service
 from .ai_service import AIService, get_ai_service
+from .odoo_budget import OdooBudget, get_odoo_budget
+from .upsert_batcher import UpsertBatcher
+from .import_service import ImportFormatError, open_records
+from .webhook_coalescer import WebhookCoalescer
+from .category_index import CategoryIndex, get_category_index, resolve_categories
+from .validation import ReferenceCache, get_reference_cache, validate_products, validate_customers
 
-__all__ = ["OdooService", "get_odoo_service", "AIService", "get_ai_service"]
+__all__ = [
+    "OdooService", "get_odoo_service",
+    "AIService", "get_ai_service",
+    "OdooBudget", "get_odoo_budget",
+    "UpsertBatcher",
+    "ImportFormatError", "open_records",
+    "WebhookCoalescer",
+    "CategoryIndex", "get_category_index", "resolve_categories",
+    "ReferenceCache", "get_reference_cache", "validate_products", "validate_customers",
+]
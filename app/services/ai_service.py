@@ -6,6 +6,7 @@ import logging
 from typing import Optional
 
 from ..config import get_settings
+from ..deadline import current_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,18 @@ class AIService:
     def is_available(self) -> bool:
         return self._model is not None
     
+    def _generate(self, prompt: str) -> str:
+        """Call Gemini, bounded by the calling thread's request deadline"""
+        deadline = current_deadline()
+        if deadline is None:
+            response = self._model.generate_content(prompt)
+        else:
+            deadline.check()
+            response = self._model.generate_content(
+                prompt, request_options={"timeout": max(0.1, deadline.remaining())}
+            )
+        return response.text.strip()
+    
     def generate_product_name(
         self, 
         product_code: str, 
@@ -52,8 +65,7 @@ class AIService:
 Return ONLY the product name, no explanation.
 Example format: "UniPack Smart Line 120 (3-Ply)"
 """
-            response = self._model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate(prompt)
         except Exception as e:
             logger.error(f"Gemini error: {e}")
             return f"UniPack {machine_name}"
@@ -77,8 +89,7 @@ Example format: "UniPack Smart Line 120 (3-Ply)"
 Write 2-3 paragraphs highlighting key features and benefits.
 Focus on: reliability, efficiency, quality output, and ROI.
 """
-            response = self._model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate(prompt)
         except Exception as e:
             logger.error(f"Gemini error: {e}")
             return f"{product_name} - Professional corrugated packaging equipment."
@@ -0,0 +1,332 @@
+"""
+Product category resolution by path
+
+Sheets users think in paths like "All / Machinery / Corrugation". The index
+is a trie over the normalized segments of every product.category
+complete_name, so a path resolves in O(path length) with no Odoo lookup.
+It refreshes incrementally (by write_date) and reloads fully every
+reference_cache_ttl to drop deleted categories.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from ..config import get_settings
+from .odoo_service import get_odoo_service
+from .odoo_budget import get_odoo_budget
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = "/"
+
+
+class CategoryResolutionError(Exception):
+    """Category path or name cannot be resolved to a single category"""
+
+
+def normalize_segment(segment: str) -> str:
+    """Case- and whitespace-insensitive form of one path segment"""
+    return " ".join(segment.split()).casefold()
+
+
+def split_path(path: str) -> List[str]:
+    """'All /  machinery/Corrugation' -> ['All', 'machinery', 'Corrugation']"""
+    return [" ".join(part.split()) for part in path.split(PATH_SEPARATOR) if part.strip()]
+
+
+class _Node:
+    __slots__ = ("children", "id", "name")
+
+    def __init__(self, name: str = ""):
+        self.children: Dict[str, "_Node"] = {}
+        self.id: Optional[int] = None
+        self.name = name
+
+
+class CategoryIndex:
+    """In-memory trie of product.category complete_name paths"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.refresh_interval = self.settings.category_refresh_seconds
+        self.reload_interval = self.settings.reference_cache_ttl
+        self._lock = threading.RLock()
+        self._root = _Node()
+        self._paths: Dict[int, Tuple[str, ...]] = {}
+        self._names: Dict[int, str] = {}
+        self._by_name: Dict[str, Set[int]] = {}
+        self._last_write_date: Optional[str] = None
+        self._refreshed_at = 0.0
+        self._reloaded_at = 0.0
+
+    # ============== Trie maintenance ==============
+
+    def _insert(self, category_id: int, complete_name: str) -> None:
+        segments = split_path(complete_name or "")
+        if not segments:
+            return
+        self._remove(category_id)
+
+        node = self._root
+        for segment in segments:
+            key = normalize_segment(segment)
+            node = node.children.setdefault(key, _Node(segment))
+        node.id = category_id
+        node.name = segments[-1]
+
+        path = tuple(normalize_segment(s) for s in segments)
+        self._paths[category_id] = path
+        self._names[category_id] = " / ".join(segments)
+        self._by_name.setdefault(path[-1], set()).add(category_id)
+
+    def _remove(self, category_id: int) -> None:
+        path = self._paths.pop(category_id, None)
+        if path is None:
+            return
+        self._names.pop(category_id, None)
+        self._by_name.get(path[-1], set()).discard(category_id)
+
+        # Clear the id and prune now-empty branches
+        trail = [self._root]
+        for key in path:
+            trail.append(trail[-1].children[key])
+        trail[-1].id = None
+        for parent, key, node in zip(reversed(trail[:-1]), reversed(path), reversed(trail[1:])):
+            if node.id is not None or node.children:
+                break
+            del parent.children[key]
+
+    def _load(self, records: List[Dict]) -> None:
+        for record in records:
+            self._insert(record['id'], record['complete_name'])
+            write_date = record.get('write_date')
+            if write_date and (self._last_write_date is None or write_date > self._last_write_date):
+                self._last_write_date = write_date
+
+    # ============== Refresh ==============
+
+    def refresh(self, force: bool = False) -> None:
+        """Full reload when due, otherwise fetch categories changed since the last sync"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._refreshed_at < self.refresh_interval:
+                return
+
+            odoo = get_odoo_service()
+            fields = ['id', 'complete_name', 'write_date']
+            if not self._paths or now - self._reloaded_at > self.reload_interval:
+                records = odoo.execute('product.category', 'search_read', [], fields=fields)
+                self._root, self._paths, self._names, self._by_name = _Node(), {}, {}, {}
+                self._last_write_date = None
+                self._load(records)
+                self._reloaded_at = now
+            else:
+                domain = [['write_date', '>=', self._last_write_date]] if self._last_write_date else []
+                self._load(odoo.execute('product.category', 'search_read', domain, fields=fields))
+            self._refreshed_at = now
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            stale = time.monotonic() - self._reloaded_at > self.reload_interval
+            if not self._paths or stale:
+                self.refresh(force=True)
+
+    # ============== Lookup ==============
+
+    def has_id(self, category_id: int) -> bool:
+        self._ensure_loaded()
+        with self._lock:
+            if category_id in self._paths:
+                return True
+        # Might have been created in Odoo since the last sync
+        self.refresh()
+        with self._lock:
+            return category_id in self._paths
+
+    def _walk(self, node: _Node, keys: List[str]) -> Tuple[_Node, int]:
+        """Deepest node reachable along keys, and how many keys were consumed"""
+        depth = 0
+        for key in keys:
+            child = node.children.get(key)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+        return node, depth
+
+    def _lookup(self, path: str) -> Optional[int]:
+        keys = [normalize_segment(s) for s in split_path(path)]
+        if not keys:
+            raise CategoryResolutionError("Empty category")
+
+        node, depth = self._walk(self._root, keys)
+        if depth == len(keys) and node.id is not None:
+            return node.id
+
+        # Paths may start below the root: a bare name ("Corrugation") or a
+        # partial path ("Machinery / Corrugation" under "All")
+        matches = set()
+        for start in self._by_name.get(keys[0], set()):
+            full = list(self._paths[start]) + keys[1:]
+            node, depth = self._walk(self._root, full)
+            if depth == len(full) and node.id is not None:
+                matches.add(node.id)
+        if matches:
+            return self._unique(path, matches)
+        return None
+
+    def _candidates(self, ids: Set[int]) -> str:
+        return ", ".join(sorted(f"{self._names[i]} (id {i})" for i in ids))
+
+    def _unique(self, path: str, ids: Set[int]) -> int:
+        if len(ids) > 1:
+            raise CategoryResolutionError(
+                f"Category '{path}' is ambiguous: {self._candidates(ids)}"
+            )
+        return next(iter(ids))
+
+    def resolve(self, path: str) -> Optional[int]:
+        """Category id for a path or name, None if it does not exist"""
+        self._ensure_loaded()
+        with self._lock:
+            found = self._lookup(path)
+        if found is None:
+            self.refresh()
+            with self._lock:
+                found = self._lookup(path)
+        return found
+
+    # ============== Creation ==============
+
+    def _anchor(self, path: str) -> List[str]:
+        """
+        Full path (root first) for a path to be created. A path that does not
+        start at an existing root is placed under the one category named like
+        its first segment, else under the sole root (e.g. "All"). New roots
+        are never created.
+        """
+        segments = split_path(path)
+        if not segments:
+            raise CategoryResolutionError("Empty category")
+        first = normalize_segment(segments[0])
+        if first in self._root.children:
+            return segments
+
+        ids = self._by_name.get(first, set())
+        if len(ids) > 1:
+            raise CategoryResolutionError(
+                f"Category '{path}' not created: '{segments[0]}' is ambiguous "
+                f"({self._candidates(ids)}); give the full path"
+            )
+        if ids:
+            return split_path(self._names[next(iter(ids))]) + segments[1:]
+        if len(self._root.children) == 1:
+            return [next(iter(self._root.children.values())).name] + segments
+        raise CategoryResolutionError(
+            f"Category '{path}' not created: '{segments[0]}' is not an existing "
+            f"category and there are several roots; give the full path"
+        )
+
+    def create_missing(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Create the missing trailing categories of the given paths under their
+        deepest existing ancestor. Categories are created one depth level at a
+        time, each level in a single multi-record create call. The host-wide
+        lock and the forced refresh keep two workers from creating the same
+        path twice. Returns an error per path that could not be anchored.
+        """
+        odoo = get_odoo_service()
+        errors: Dict[str, str] = {}
+        with self._lock, get_odoo_budget().host_lock("product-category-create"):
+            # Pick up categories another worker created since our last sync
+            self.refresh(force=True)
+            wanted = {}
+            for path in paths:
+                try:
+                    segments = self._anchor(path)
+                except CategoryResolutionError as e:
+                    errors[path] = str(e)
+                    continue
+                for depth in range(1, len(segments) + 1):
+                    prefix = segments[:depth]
+                    wanted.setdefault(tuple(normalize_segment(s) for s in prefix), prefix)
+
+            for depth in range(1, max((len(k) for k in wanted), default=0) + 1):
+                level = []
+                for keys, segments in wanted.items():
+                    if len(keys) != depth:
+                        continue
+                    node, found = self._walk(self._root, list(keys))
+                    if found == depth and node.id is not None:
+                        continue
+                    vals = {'name': segments[-1]}
+                    if depth > 1:
+                        parent, _ = self._walk(self._root, list(keys[:-1]))
+                        vals['parent_id'] = parent.id
+                    level.append((segments, vals))
+                if not level:
+                    continue
+
+                new_ids = odoo.execute('product.category', 'create', [vals for _, vals in level])
+                for (segments, _), new_id in zip(level, new_ids):
+                    self._insert(new_id, " / ".join(segments))
+                logger.info(f"Created {len(level)} product categories at depth {depth}")
+        return errors
+
+
+def resolve_categories(rows: List[Dict], create_missing: bool = False) -> List[Optional[str]]:
+    """
+    Set category_id from the `category` path/name of each row.
+    Returns an error message per row (None if resolved or not requested).
+    """
+    wanted = [(i, row['category']) for i, row in enumerate(rows) if row.get('category')]
+    errors: List[Optional[str]] = [None] * len(rows)
+    if not wanted:
+        return errors
+
+    index = get_category_index()
+    try:
+        resolved = {}
+        missing = []
+        for i, path in wanted:
+            try:
+                resolved[i] = index.resolve(path)
+            except CategoryResolutionError as e:
+                errors[i] = str(e)
+                continue
+            if resolved[i] is None:
+                missing.append(path)
+
+        if missing and create_missing:
+            failed = index.create_missing(missing)
+            for i, path in wanted:
+                if errors[i] is None and resolved[i] is None:
+                    if path in failed:
+                        errors[i] = failed[path]
+                    else:
+                        resolved[i] = index.resolve(path)
+    except Exception as e:
+        logger.error(f"Category resolution failed: {e}")
+        for i, _ in wanted:
+            errors[i] = errors[i] or f"Category resolution failed: {e}"
+        return errors
+
+    for i, path in wanted:
+        if errors[i] is not None:
+            continue
+        if resolved[i] is None:
+            errors[i] = f"Category '{path}' not found"
+        else:
+            rows[i]['category_id'] = resolved[i]
+    return errors
+
+
+# Singleton
+_category_index: Optional[CategoryIndex] = None
+
+def get_category_index() -> CategoryIndex:
+    global _category_index
+    if _category_index is None:
+        _category_index = CategoryIndex()
+    return _category_index
@@ -0,0 +1,214 @@
+"""
+CSV/XLSX file ingestion
+
+Rows are read lazily from the uploaded file (csv.reader / openpyxl
+read-only mode) and mapped onto Product/Customer fields, so an import never
+holds more than one chunk of rows in memory.
+"""
+
+import csv
+import io
+import re
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Try to import openpyxl
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+    logger.warning("openpyxl not installed, XLSX import disabled")
+
+
+class ImportFormatError(Exception):
+    """Uploaded file or column mapping cannot be used"""
+
+
+# Header aliases (normalized) for the NocoDB/Sheets column names
+PRODUCT_ALIASES = {
+    "code": "product_code",
+    "name": "product_name",
+    "product_category": "category",
+    "category_path": "category",
+    "price": "sales_price",
+    "purchase_price": "cost",
+    "hsn": "hsn_code",
+    "sales_tax": "sales_tax_id",
+    "tax_id": "sales_tax_id",
+}
+
+CUSTOMER_ALIASES = {
+    "customer_name": "company_name",
+    "name": "company_name",
+    "contact_person": "contact_name",
+    "address_1": "address_line_1",
+    "address_2": "address_line_2",
+    "zip": "pincode",
+    "gst": "gst_number",
+    "gstin": "gst_number",
+    "pan_number": "pan",
+}
+
+# NocoDB Links columns (add-table-links.js). Webhook rows carry the linked
+# record count there, not a value, so they are never mapped from webhooks.
+PRODUCT_LINK_COLUMNS = {
+    "product_category", "sales_tax", "purchase_tax", "unit_of_measure",
+    "machine_type", "machine_size", "assembly_type", "kit_type", "product_type_code",
+}
+
+CUSTOMER_LINK_COLUMNS = {"state", "country", "gst_treatment"}
+
+
+def normalize_header(header: str) -> str:
+    """'Product Code ' -> 'product_code'"""
+    return re.sub(r"[^0-9a-z]+", "_", str(header).strip().lower()).strip("_")
+
+
+def build_column_map(
+    headers: List[str],
+    fields: List[str],
+    aliases: Dict[str, str],
+    overrides: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Map file headers to model fields; explicit overrides win over guesses"""
+    overrides = {normalize_header(k): v for k, v in (overrides or {}).items()}
+    unknown = set(overrides.values()) - set(fields)
+    if unknown:
+        raise ImportFormatError(f"Unknown target field(s) in column_map: {', '.join(sorted(unknown))}")
+
+    mapping = {}
+    for header in headers:
+        if header is None:
+            continue
+        key = normalize_header(header)
+        if key in overrides:
+            mapping[header] = overrides[key]
+        elif key in fields:
+            mapping[header] = key
+        elif key in aliases:
+            mapping[header] = aliases[key]
+    return mapping
+
+
+def _cell(value: Any) -> Optional[str]:
+    """Cell value as the string pydantic would get from JSON; None for blanks"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _open_csv(file: BinaryIO) -> Tuple[Optional[List], Iterator[Tuple]]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    return next(reader, None), (tuple(row) for row in reader)
+
+
+def _open_xlsx(file: BinaryIO) -> Tuple[Optional[List], Iterator[Tuple]]:
+    if not OPENPYXL_AVAILABLE:
+        raise ImportFormatError("XLSX import requires openpyxl")
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    rows = workbook.active.iter_rows(values_only=True)
+    headers = next(rows, None)
+    if headers is None:
+        workbook.close()
+        return None, iter(())
+
+    def data() -> Iterator[Tuple]:
+        try:
+            yield from rows
+        finally:
+            workbook.close()
+
+    return list(headers), data()
+
+
+def _records(rows: Iterator[Tuple], columns: List[Tuple[int, str]]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    # Row 1 is the header, so data starts on row 2
+    for row_number, values in enumerate(rows, start=2):
+        record = {}
+        for i, field in columns:
+            value = _cell(values[i]) if i < len(values) else None
+            if value is not None:
+                record[field] = value
+        if record:
+            yield row_number, record
+
+
+def open_records(
+    file: BinaryIO,
+    filename: str,
+    fields: List[str],
+    aliases: Dict[str, str],
+    overrides: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Read and map the header row, then return an iterator of
+    (sheet row number, {field: value}) for every non-blank data row.
+    Blank cells are left out so model defaults apply. Blocking.
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        opener = _open_csv
+    elif name.endswith(".xlsx"):
+        opener = _open_xlsx
+    else:
+        raise ImportFormatError("Unsupported file type, expected .csv or .xlsx")
+
+    try:
+        headers, rows = opener(file)
+    except ImportFormatError:
+        raise
+    except Exception as e:
+        raise ImportFormatError(f"Could not read file: {e}")
+    if not headers:
+        raise ImportFormatError("File has no header row")
+
+    mapping = build_column_map(headers, fields, aliases, overrides)
+    if not mapping:
+        raise ImportFormatError("No columns could be mapped to known fields")
+    columns = [(i, mapping[h]) for i, h in enumerate(headers) if h in mapping]
+    return _records(rows, columns)
+
+
+def map_record(
+    raw: Dict[str, Any],
+    fields: List[str],
+    aliases: Dict[str, str],
+    overrides: Optional[Dict[str, str]] = None,
+    exclude: Optional[Set[str]] = None,
+) -> Dict[str, str]:
+    """
+    Map one {header: value} record (e.g. a NocoDB row) onto model fields.
+    Headers whose normalized form is in `exclude` are ignored.
+    """
+    exclude = exclude or set()
+    headers = [h for h in raw if normalize_header(h) not in exclude]
+    mapping = build_column_map(headers, fields, aliases, overrides)
+    record = {}
+    for header, field in mapping.items():
+        value = raw[header]
+        if isinstance(value, (dict, list)):
+            # Linked records / attachments have no scalar field to map to
+            continue
+        value = _cell(value)
+        if value is not None:
+            record[field] = value
+    return record
+
+
+def take(records: Iterator, size: int) -> List:
+    """Next chunk of at most `size` records (blocking, run in a thread)"""
+    try:
+        return list(islice(records, size))
+    except ImportFormatError:
+        raise
+    except Exception as e:
+        # csv.Error, UnicodeDecodeError, corrupt XLSX parts, ...
+        raise ImportFormatError(f"Could not read file: {e}")
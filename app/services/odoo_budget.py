@@ -0,0 +1,252 @@
+"""
+Cross-process Odoo concurrency budget
+
+Every uvicorn worker has its own thread pool, so the per-process executor size
+does not bound the load on Odoo. The budget is a set of slot files in a shared
+directory; an RPC holds an exclusive flock on one slot for its duration, which
+caps in-flight calls across all workers on the host.
+
+The last `odoo_priority_slots` slots are reserved for the interactive lane, so
+bulk batches can never starve reference lookups and health checks.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+import logging
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# flock is POSIX only; elsewhere fall back to a per-process semaphore
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    logger.warning("fcntl not available, Odoo budget is per-process only")
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+
+class OdooBudgetTimeout(Exception):
+    """Raised when no Odoo slot frees up within the budget timeout"""
+
+
+class OdooBudget:
+    """Host-wide semaphore for Odoo XML-RPC calls with a priority lane"""
+
+    POLL_INTERVAL = 0.01
+    MAX_POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.total = max(1, self.settings.odoo_max_concurrency)
+        self.reserved = min(max(0, self.settings.odoo_priority_slots), self.total - 1)
+        self.shared = self.total - self.reserved
+        self.timeout = self.settings.odoo_budget_timeout
+        self.directory = self.settings.odoo_budget_dir
+        self.is_global = FCNTL_AVAILABLE
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._in_flight = {INTERACTIVE: 0, BULK: 0}
+        self._timeouts = 0
+        self._host_locks: Dict[str, threading.Lock] = {}
+
+        if self.is_global:
+            os.makedirs(self.directory, exist_ok=True)
+        else:
+            self._shared_sem = threading.BoundedSemaphore(self.shared)
+            self._reserved_sem = threading.BoundedSemaphore(self.reserved or 1)
+
+    def _slot_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"slot-{index}.lock")
+
+    # ============== Lanes ==============
+
+    @property
+    def current_lane(self) -> str:
+        return getattr(self._local, "lane", INTERACTIVE)
+
+    @contextmanager
+    def lane(self, name: str):
+        """Run Odoo calls made by this thread in the given lane"""
+        previous = self.current_lane
+        self._local.lane = name
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    # ============== Slots ==============
+
+    def _try_lock(self, index: int) -> Optional[int]:
+        fd = os.open(self._slot_path(index), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            os.close(fd)
+            return None
+
+    def _acquire_global(self, lane: str, timeout: float) -> int:
+        # Interactive calls try shared slots first and spill into reserved ones
+        candidates = range(self.total if lane == INTERACTIVE else self.shared)
+        deadline = time.monotonic() + timeout
+        interval = self.POLL_INTERVAL
+        while True:
+            for index in candidates:
+                fd = self._try_lock(index)
+                if fd is not None:
+                    return fd
+            if time.monotonic() >= deadline:
+                raise OdooBudgetTimeout(
+                    f"No Odoo slot free after {timeout:.1f}s ({lane} lane)"
+                )
+            time.sleep(interval * (0.5 + random.random()))
+            interval = min(interval * 2, self.MAX_POLL_INTERVAL)
+
+    def _acquire_local(self, lane: str, timeout: float) -> threading.BoundedSemaphore:
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._shared_sem.acquire(blocking=False):
+                return self._shared_sem
+            if lane == INTERACTIVE and self.reserved and self._reserved_sem.acquire(blocking=False):
+                return self._reserved_sem
+            if time.monotonic() >= deadline:
+                raise OdooBudgetTimeout(
+                    f"No Odoo slot free after {timeout:.1f}s ({lane} lane)"
+                )
+            time.sleep(self.POLL_INTERVAL)
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """Hold one Odoo slot for the duration of the block"""
+        lane = self.current_lane
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            if self.is_global:
+                handle = self._acquire_global(lane, timeout)
+            else:
+                handle = self._acquire_local(lane, timeout)
+        except OdooBudgetTimeout:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+
+        with self._stats_lock:
+            self._in_flight[lane] += 1
+        try:
+            yield
+        finally:
+            with self._stats_lock:
+                self._in_flight[lane] -= 1
+            if self.is_global:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                os.close(handle)
+            else:
+                handle.release()
+
+    @contextmanager
+    def host_lock(self, name: str):
+        """Exclusive lock held across all workers on this host"""
+        if not self.is_global:
+            with self._stats_lock:
+                lock = self._host_locks.setdefault(name, threading.Lock())
+            with lock:
+                yield
+            return
+
+        fd = os.open(os.path.join(self.directory, f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    # ============== Shared auth ==============
+
+    def shared_uid(self, key: str, authenticate: Callable[[], Optional[int]]) -> Optional[int]:
+        """Authenticate once per host and share the uid with the other workers"""
+        if not self.is_global:
+            return authenticate()
+
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        path = os.path.join(self.directory, f"uid-{digest}")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            cached = os.read(fd, 32).decode().strip()
+            if cached.isdigit() and int(cached) > 0:
+                return int(cached)
+            uid = authenticate()
+            if uid:
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, str(uid).encode())
+            return uid
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def forget_uid(self, key: str) -> None:
+        """Drop a shared uid that Odoo no longer accepts"""
+        if not self.is_global:
+            return
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        try:
+            os.remove(os.path.join(self.directory, f"uid-{digest}"))
+        except FileNotFoundError:
+            pass
+
+    # ============== Reporting ==============
+
+    def status(self) -> Dict:
+        """Current utilization (global across workers when flock is available)"""
+        with self._stats_lock:
+            process_in_flight = dict(self._in_flight)
+            timeouts = self._timeouts
+
+        if self.is_global:
+            busy = []
+            for index in range(self.total):
+                fd = self._try_lock(index)
+                if fd is None:
+                    busy.append(index)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+            in_use = len(busy)
+            reserved_in_use = sum(1 for index in busy if index >= self.shared)
+        else:
+            in_use = sum(process_in_flight.values())
+            reserved_in_use = max(0, in_use - self.shared)
+
+        return {
+            "scope": "global" if self.is_global else "process",
+            "total_slots": self.total,
+            "priority_slots": self.reserved,
+            "in_use": in_use,
+            "priority_in_use": reserved_in_use,
+            "utilization": round(in_use / self.total, 3),
+            "process_in_flight": process_in_flight,
+            "process_timeouts": timeouts,
+        }
+
+
+# Singleton
+_odoo_budget: Optional[OdooBudget] = None
+
+def get_odoo_budget() -> OdooBudget:
+    global _odoo_budget
+    if _odoo_budget is None:
+        _odoo_budget = OdooBudget()
+    return _odoo_budget
@@ -4,14 +4,39 @@ Odoo XML-RPC Service
 
 import xmlrpc.client
 import ssl
-from typing import Optional, Dict, Any, List
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Optional, Dict, Any, List, Callable
 import logging
 
 from ..config import get_settings
+from ..deadline import DeadlineExceeded, current_deadline
+from .odoo_budget import OdooBudgetTimeout, get_odoo_budget
 
 logger = logging.getLogger(__name__)
 
 
+class _DeadlineTimeoutMixin:
+    """Size each XML-RPC socket timeout from the calling thread's deadline"""
+    
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        deadline = current_deadline()
+        timeout = max(0.1, deadline.remaining()) if deadline else None
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+
+class _DeadlineTransport(_DeadlineTimeoutMixin, xmlrpc.client.Transport):
+    pass
+
+
+class _DeadlineSafeTransport(_DeadlineTimeoutMixin, xmlrpc.client.SafeTransport):
+    pass
+
+
 class OdooService:
     """Service for Odoo XML-RPC operations"""
     
@@ -26,16 +51,28 @@ class OdooService:
         self._uid: Optional[int] = None
         self._common = None
         self._models = None
+        self._state_ids: Optional[Dict[str, int]] = None
+        self.budget = get_odoo_budget()
+        self._local = threading.local()
+    
+    @property
+    def _auth_key(self) -> str:
+        return f"{self.url}|{self.db}|{self.username}|{self.api_key}"
     
     def _get_ssl_context(self):
         return ssl.create_default_context()
     
+    def _get_transport(self):
+        if self.url.startswith('https'):
+            return _DeadlineSafeTransport(context=self._get_ssl_context())
+        return _DeadlineTransport()
+    
     @property
     def common(self):
         if self._common is None:
             self._common = xmlrpc.client.ServerProxy(
                 f'{self.url}/xmlrpc/2/common',
-                context=self._get_ssl_context()
+                transport=self._get_transport()
             )
         return self._common
     
@@ -44,17 +81,49 @@ class OdooService:
         if self._models is None:
             self._models = xmlrpc.client.ServerProxy(
                 f'{self.url}/xmlrpc/2/object',
-                context=self._get_ssl_context()
+                transport=self._get_transport()
             )
         return self._models
     
-    def authenticate(self) -> Optional[int]:
-        """Authenticate and return uid"""
-        try:
-            self._uid = self.common.authenticate(
+    @property
+    def rpc_count(self) -> int:
+        """Odoo calls sent so far by the current thread"""
+        return getattr(self._local, 'rpc_count', 0)
+    
+    @contextmanager
+    def _slot(self):
+        """Budget slot whose wait is bounded by the request deadline"""
+        deadline = current_deadline()
+        if deadline is None:
+            with self.budget.slot():
+                yield
+            return
+        
+        deadline.check()
+        remaining = deadline.remaining()
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(self.budget.slot(timeout=min(self.budget.timeout, remaining)))
+            except OdooBudgetTimeout:
+                if remaining < self.budget.timeout:
+                    # The wait was cut short by the deadline, not by the budget
+                    raise DeadlineExceeded(f"Request deadline of {deadline.timeout:.1f}s exceeded")
+                raise
+            yield
+    
+    def _authenticate_rpc(self) -> Optional[int]:
+        with self._slot():
+            return self.common.authenticate(
                 self.db, self.username, self.api_key, {}
             )
+    
+    def authenticate(self) -> Optional[int]:
+        """Authenticate and return uid (shared across workers)"""
+        try:
+            self._uid = self.budget.shared_uid(self._auth_key, self._authenticate_rpc)
             return self._uid
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Odoo auth error: {e}")
             return None
@@ -68,7 +137,8 @@ class OdooService:
     def check_connection(self) -> bool:
         """Check Odoo connection"""
         try:
-            self.common.version()
+            with self.budget.slot():
+                self.common.version()
             return self.uid is not None and self.uid > 0
         except Exception as e:
             logger.error(f"Odoo connection error: {e}")
@@ -76,12 +146,22 @@ class OdooService:
     
     def execute(self, model: str, method: str, *args, **kwargs) -> Any:
         """Execute Odoo method"""
-        if not self.uid:
+        uid = self.uid
+        if not uid:
             raise Exception("Not authenticated")
-        return self.models.execute_kw(
-            self.db, self.uid, self.api_key,
-            model, method, list(args), kwargs
-        )
+        try:
+            with self._slot():
+                self._local.rpc_count = self.rpc_count + 1
+                return self.models.execute_kw(
+                    self.db, uid, self.api_key,
+                    model, method, list(args), kwargs
+                )
+        except xmlrpc.client.Fault as e:
+            # A uid cached by another worker may have been revoked
+            if 'AccessDenied' in str(e.faultString):
+                self.budget.forget_uid(self._auth_key)
+                self._uid = None
+            raise
     
     # ============== Reference Data ==============
     
@@ -118,30 +198,165 @@ class OdooService:
         )
         return states[0] if states else None
     
+    def get_state_ids(self) -> Dict[str, int]:
+        """Get all Indian states as {lowercase name: id} (cached)"""
+        if self._state_ids is None:
+            states = self.execute(
+                'res.country.state', 'search_read',
+                [['country_id', '=', self.INDIA_COUNTRY_ID]],
+                fields=['id', 'name']
+            )
+            self._state_ids = {s['name'].lower(): s['id'] for s in states}
+        return self._state_ids
+    
+    def match_state_id(self, state_name: str) -> Optional[int]:
+        """Resolve a state name locally, mirroring the ilike search"""
+        if not state_name:
+            return None
+        name = state_name.strip().lower()
+        states = self.get_state_ids()
+        if name in states:
+            return states[name]
+        for full_name, state_id in states.items():
+            if name in full_name:
+                return state_id
+        return None
+    
+    # ============== Bulk Upsert ==============
+    
+    def _bulk_upsert(
+        self, model: str, key_field: str, keys: List[Optional[str]], vals_list: List[Optional[Dict]]
+    ) -> List[Dict]:
+        """
+        Upsert many records with one search and one create call.
+        
+        keys[i] is the natural key (matched against key_field) or empty for
+        always-create. vals_list[i] is None for rows that already failed.
+        Writes stay per-row since every row carries different values.
+        """
+        results: List[Optional[Dict]] = [None] * len(vals_list)
+        
+        lookup = sorted({k for k, v in zip(keys, vals_list) if k and v is not None})
+        existing: Dict[str, int] = {}
+        if lookup:
+            for record in self.execute(
+                model, 'search_read', [[key_field, 'in', lookup]],
+                fields=['id', key_field]
+            ):
+                existing.setdefault(record[key_field], record['id'])
+        
+        to_write, to_create, duplicates = [], [], []
+        first_create: Dict[str, int] = {}
+        for i, (key, vals) in enumerate(zip(keys, vals_list)):
+            if vals is None:
+                continue
+            if key and key in existing:
+                to_write.append((i, existing[key]))
+            elif key and key in first_create:
+                # Same key twice in one flush: create once, then write
+                duplicates.append((i, first_create[key]))
+            else:
+                if key:
+                    first_create[key] = i
+                to_create.append(i)
+        
+        if to_create:
+            try:
+                new_ids = self.execute(model, 'create', [vals_list[i] for i in to_create])
+                for i, new_id in zip(to_create, new_ids):
+                    results[i] = {"success": True, "id": new_id, "message": "Created"}
+            except (xmlrpc.client.Fault, TypeError, DeadlineExceeded, OdooBudgetTimeout):
+                # Odoo rejected the batch and rolled it back, or it was never sent
+                # (unmarshallable vals, no slot in time); retry per row to isolate the bad one
+                for i in to_create:
+                    try:
+                        new_id = self.execute(model, 'create', vals_list[i])
+                        results[i] = {"success": True, "id": new_id, "message": "Created"}
+                    except Exception as e:
+                        results[i] = {"success": False, "id": None, "message": str(e)}
+            except Exception as e:
+                # Socket/protocol errors after sending: the create may have committed, so never retry
+                for i in to_create:
+                    results[i] = {"success": False, "id": None, "message": str(e)}
+        
+        for i, first in duplicates:
+            if results[first] and results[first]["success"]:
+                to_write.append((i, results[first]["id"]))
+            else:
+                results[i] = results[first]
+        
+        for i, record_id in to_write:
+            try:
+                self.execute(model, 'write', [record_id], vals_list[i])
+                results[i] = {"success": True, "id": record_id, "message": "Updated"}
+            except Exception as e:
+                results[i] = {"success": False, "id": None, "message": str(e)}
+        
+        return results
+    
+    def _bulk_rows(
+        self, model: str, key_field: str, key_name: str,
+        rows: List[Dict], build_vals: Callable[[Dict], Dict]
+    ) -> List[Dict]:
+        """Build vals for each row, then bulk upsert the ones that built cleanly"""
+        failures: Dict[int, Dict] = {}
+        vals_list: List[Optional[Dict]] = []
+        for i, data in enumerate(rows):
+            try:
+                vals_list.append(build_vals(data))
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                vals_list.append(None)
+                failures[i] = {"success": False, "id": None, "message": str(e)}
+        
+        keys = [data.get(key_name) or None for data in rows]
+        try:
+            results = self._bulk_upsert(model, key_field, keys, vals_list)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            return [failures.get(i) or {"success": False, "id": None, "message": str(e)}
+                    for i in range(len(rows))]
+        return [failures.get(i) or r for i, r in enumerate(results)]
+    
     # ============== Products ==============
     
+    # Row field -> product.template field. Only fields present in the row are
+    # written, so partial rows (NocoDB webhooks) leave the rest untouched.
+    PRODUCT_FIELDS = {
+        'product_code': 'default_code',
+        'sales_price': 'list_price',
+        'cost': 'standard_price',
+        'category_id': 'categ_id',
+        'description': 'description_sale',
+    }
+    
+    def _product_vals(self, data: Dict) -> Dict:
+        vals = {
+            'name': data['product_name'],
+            'type': 'consu',
+            'sale_ok': True,
+            'purchase_ok': True,
+        }
+        for field, odoo_field in self.PRODUCT_FIELDS.items():
+            if data.get(field) is not None:
+                vals[odoo_field] = data[field]
+        
+        # HSN Code (India localization)
+        if data.get('hsn_code'):
+            vals['l10n_in_hsn_code'] = data['hsn_code']
+        
+        # Sales Tax
+        if data.get('sales_tax_id'):
+            vals['taxes_id'] = [(6, 0, [data['sales_tax_id']])]
+        
+        return vals
+    
     def create_or_update_product(self, data: Dict) -> Dict:
         """Create or update a product"""
         try:
-            vals = {
-                'name': data['product_name'],
-                'default_code': data.get('product_code', ''),
-                'list_price': data.get('sales_price', 0),
-                'standard_price': data.get('cost', 0),
-                'categ_id': data.get('category_id', 1),
-                'description_sale': data.get('description', ''),
-                'type': 'consu',
-                'sale_ok': True,
-                'purchase_ok': True,
-            }
-            
-            # HSN Code (India localization)
-            if data.get('hsn_code'):
-                vals['l10n_in_hsn_code'] = data['hsn_code']
-            
-            # Sales Tax
-            if data.get('sales_tax_id'):
-                vals['taxes_id'] = [(6, 0, [data['sales_tax_id']])]
+            vals = self._product_vals(data)
             
             # Check if exists by product_code
             existing = None
@@ -159,38 +374,60 @@ class OdooService:
                 new_id = self.execute('product.template', 'create', vals)
                 return {"success": True, "id": new_id, "message": "Created"}
                 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             return {"success": False, "id": None, "message": str(e)}
     
+    def bulk_upsert_products(self, rows: List[Dict]) -> List[Dict]:
+        """Create or update many products in as few round trips as possible"""
+        return self._bulk_rows(
+            'product.template', 'default_code', 'product_code', rows, self._product_vals
+        )
+    
     # ============== Customers ==============
     
+    # Row field -> res.partner field (only fields present in the row are written)
+    CUSTOMER_FIELDS = {
+        'mobile': 'mobile',
+        'phone': 'phone',
+        'email': 'email',
+        'address_line_1': 'street',
+        'address_line_2': 'street2',
+        'city': 'city',
+        'pincode': 'zip',
+    }
+    
+    def _customer_vals(self, data: Dict, state_id: Optional[int]) -> Dict:
+        vals = {
+            'name': data['company_name'],
+            'is_company': True,
+            'country_id': self.INDIA_COUNTRY_ID,
+            'customer_rank': 1,
+        }
+        for field, odoo_field in self.CUSTOMER_FIELDS.items():
+            if data.get(field) is not None:
+                vals[odoo_field] = data[field]
+        
+        # XML-RPC cannot marshal None; leave the state unset when unknown
+        if state_id:
+            vals['state_id'] = state_id
+        
+        # GST Number (India localization)
+        if data.get('gst_number'):
+            vals['vat'] = data['gst_number']
+        
+        # PAN (India localization)
+        if data.get('pan'):
+            vals['l10n_in_pan'] = data['pan']
+        
+        return vals
+    
     def create_or_update_customer(self, data: Dict) -> Dict:
         """Create or update a customer (res.partner)"""
         try:
             state_id = self.get_state_id(data.get('state', ''))
-            
-            vals = {
-                'name': data['company_name'],
-                'is_company': True,
-                'mobile': data.get('mobile', ''),
-                'phone': data.get('phone', ''),
-                'email': data.get('email', ''),
-                'street': data.get('address_line_1', ''),
-                'street2': data.get('address_line_2', ''),
-                'city': data.get('city', ''),
-                'state_id': state_id,
-                'zip': data.get('pincode', ''),
-                'country_id': self.INDIA_COUNTRY_ID,
-                'customer_rank': 1,
-            }
-            
-            # GST Number (India localization)
-            if data.get('gst_number'):
-                vals['vat'] = data['gst_number']
-            
-            # PAN (India localization)
-            if data.get('pan'):
-                vals['l10n_in_pan'] = data['pan']
+            vals = self._customer_vals(data, state_id)
             
             # Check if exists by GST
             existing = None
@@ -208,8 +445,17 @@ class OdooService:
                 new_id = self.execute('res.partner', 'create', vals)
                 return {"success": True, "id": new_id, "message": "Created"}
                 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             return {"success": False, "id": None, "message": str(e)}
+    
+    def bulk_upsert_customers(self, rows: List[Dict]) -> List[Dict]:
+        """Create or update many customers in as few round trips as possible"""
+        def vals_for(data: Dict) -> Dict:
+            return self._customer_vals(data, self.match_state_id(data.get('state', '')))
+        
+        return self._bulk_rows('res.partner', 'vat', 'gst_number', rows, vals_for)
 
 
 # Singleton
@@ -0,0 +1,97 @@
+"""
+Cross-request micro-batching for product/customer upserts
+
+The Sheets add-on sends many tiny batches as users edit rows. The batcher
+collects rows from concurrent requests for a few milliseconds (or until
+max_rows are waiting), runs them as one bulk Odoo upsert in the thread pool
+and hands each row's result back to the request that submitted it.
+
+Rows whose request deadline has passed by flush time are dropped unsent.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from ..deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+class UpsertBatcher:
+    """Aggregates rows from concurrent requests into bulk upserts"""
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[List[Dict], Optional[Deadline]], List[Dict]],
+        executor: Executor,
+        window_ms: float = 5.0,
+        max_rows: int = 50,
+    ):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.executor = executor
+        self.window = max(0.0, window_ms) / 1000
+        self.max_rows = max(1, max_rows)
+        self._pending: List[Tuple[Dict, Optional[Deadline], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, row: Dict, deadline: Optional[Deadline] = None) -> Dict:
+        """Queue one row and wait for its upsert result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, deadline, future))
+
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    async def submit_many(self, rows: List[Dict], deadline: Optional[Deadline] = None) -> List[Dict]:
+        """Queue rows together so they share flushes; results keep input order"""
+        return list(await asyncio.gather(*(self.submit(row, deadline) for row in rows)))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_rows]
+            self._pending = self._pending[self.max_rows:]
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Dict, Optional[Deadline], asyncio.Future]]) -> None:
+        live = []
+        for row, deadline, future in batch:
+            if future.done():
+                continue
+            if deadline is not None and deadline.expired:
+                future.set_result(deadline.skipped_result())
+            else:
+                live.append((row, deadline, future))
+        if not live:
+            return
+
+        # The flush serves every live row, so it runs until the latest deadline
+        deadlines = [deadline for _, deadline, _ in live]
+        flush_deadline = None if None in deadlines else max(deadlines, key=lambda d: d.expires_at)
+
+        rows = [row for row, _, _ in live]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.flush_fn, rows, flush_deadline)
+        except Exception as e:
+            logger.error(f"{self.name} batch flush failed: {e}")
+            results = [{"success": False, "id": None, "message": str(e)}] * len(rows)
+
+        logger.debug(f"{self.name} flushed {len(rows)} rows")
+        for (_, _, future), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,162 @@
+"""
+Local row validation ahead of Odoo
+
+Category paths are resolved through the local category index, foreign keys
+(product.category, sale account.tax) are checked against locally cached ids,
+and HSN/GSTIN/PAN formats are checked offline, so a bad column fails
+instantly instead of costing a search plus a rejected create/write per row.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set
+import logging
+
+from ..config import get_settings
+from .odoo_service import get_odoo_service
+from .category_index import get_category_index, resolve_categories
+
+logger = logging.getLogger(__name__)
+
+HSN_RE = re.compile(r"^\d{4}(\d{2}){0,2}$")
+PAN_RE = re.compile(r"^[A-Z]{5}\d{4}[A-Z]$")
+GSTIN_RE = re.compile(r"^\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]$")
+GSTIN_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def gstin_check_char(gstin: str) -> str:
+    """Expected 15th character of a GSTIN (mod-36 checksum over the first 14)"""
+    total = 0
+    for i, char in enumerate(gstin[:14]):
+        product = GSTIN_CHARS.index(char) * (2 if i % 2 else 1)
+        total += product // 36 + product % 36
+    return GSTIN_CHARS[(36 - total % 36) % 36]
+
+
+class ReferenceCache:
+    """TTL cache of valid sale tax ids; category ids come from the category index"""
+
+    # An unknown id triggers at most one early refresh per this many seconds
+    MISS_REFRESH_INTERVAL = 30.0
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl = self.settings.reference_cache_ttl
+        self._lock = threading.Lock()
+        self._tax_ids: Optional[Set[int]] = None
+        self._loaded_at = 0.0
+
+    def _refresh(self) -> None:
+        self._tax_ids = {t['id'] for t in get_odoo_service().get_taxes()}
+        self._loaded_at = time.monotonic()
+
+    def _ensure(self, force: bool = False) -> bool:
+        """Load or refresh the cache; False if Odoo could not be reached"""
+        with self._lock:
+            age = time.monotonic() - self._loaded_at
+            stale = self._tax_ids is None or age > self.ttl
+            if not stale and not (force and age > self.MISS_REFRESH_INTERVAL):
+                return True
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.warning(f"Reference cache refresh failed: {e}")
+            return self._tax_ids is not None
+
+    def _contains(self, attr: str, record_id: int) -> Optional[bool]:
+        if not self._ensure():
+            return None
+        if record_id in getattr(self, attr):
+            return True
+        # Might have been created in Odoo since the last load
+        self._ensure(force=True)
+        return record_id in getattr(self, attr)
+
+    def has_category(self, category_id: int) -> Optional[bool]:
+        """None when the index is unavailable (let Odoo decide)"""
+        try:
+            return get_category_index().has_id(category_id)
+        except Exception as e:
+            logger.warning(f"Category index unavailable: {e}")
+            return None
+
+    def has_tax(self, tax_id: int) -> Optional[bool]:
+        """None when the cache is unavailable (let Odoo decide)"""
+        return self._contains('_tax_ids', tax_id)
+
+
+def _clean(data: Dict, field: str, upper: bool = True) -> str:
+    """Normalize a code field in place (strip, optionally uppercase)"""
+    value = (data.get(field) or '').strip()
+    if upper:
+        value = value.upper()
+    if field in data:
+        data[field] = value
+    return value
+
+
+def validate_product(data: Dict, cache: Optional['ReferenceCache'] = None) -> Optional[str]:
+    """Return an error message for a bad product row, None if clean"""
+    cache = cache or get_reference_cache()
+    errors = []
+
+    category_id = data.get('category_id')
+    if category_id is not None and cache.has_category(category_id) is False:
+        errors.append(f"category_id {category_id} is not a product.category")
+
+    tax_id = data.get('sales_tax_id')
+    if tax_id and cache.has_tax(tax_id) is False:
+        errors.append(f"sales_tax_id {tax_id} is not a sale account.tax")
+
+    hsn = _clean(data, 'hsn_code', upper=False)
+    if hsn and not HSN_RE.match(hsn):
+        errors.append(f"hsn_code '{hsn}' must be 4, 6 or 8 digits")
+
+    return "; ".join(errors) or None
+
+
+def validate_customer(data: Dict) -> Optional[str]:
+    """Return an error message for a bad customer row, None if clean"""
+    errors = []
+
+    gstin = _clean(data, 'gst_number')
+    if gstin:
+        if not GSTIN_RE.match(gstin):
+            errors.append(f"gst_number '{gstin}' is not a valid GSTIN format")
+        elif gstin[14] != gstin_check_char(gstin):
+            errors.append(f"gst_number '{gstin}' has an invalid check character")
+
+    pan = _clean(data, 'pan')
+    if pan:
+        if not PAN_RE.match(pan):
+            errors.append(f"pan '{pan}' is not a valid PAN format")
+        elif gstin and GSTIN_RE.match(gstin) and gstin[2:12] != pan:
+            errors.append(f"pan '{pan}' does not match gst_number '{gstin}'")
+
+    return "; ".join(errors) or None
+
+
+def validate_products(rows: List[Dict], create_missing_categories: bool = False) -> List[Optional[str]]:
+    """Resolve category paths, then validate product rows (blocking: may call Odoo)"""
+    category_errors = resolve_categories(rows, create_missing_categories)
+    cache = get_reference_cache()
+    return [
+        error or validate_product(row, cache)
+        for row, error in zip(rows, category_errors)
+    ]
+
+
+def validate_customers(rows: List[Dict]) -> List[Optional[str]]:
+    """Validate customer rows (offline format checks only)"""
+    return [validate_customer(row) for row in rows]
+
+
+# Singleton
+_reference_cache: Optional[ReferenceCache] = None
+
+def get_reference_cache() -> ReferenceCache:
+    global _reference_cache
+    if _reference_cache is None:
+        _reference_cache = ReferenceCache()
+    return _reference_cache
@@ -0,0 +1,157 @@
+"""
+Debounced, coalescing receiver for NocoDB row-change webhooks
+
+Rapid cell edits on one NocoDB row arrive as a burst of webhook events. Each
+record is held until it has been quiet for the debounce window (or has been
+held for max_delay), keeping only its latest state; everything due at the
+same moment is flushed to the upsert path as one bulk batch per table kind.
+
+States are ordered by NocoDB's UpdatedAt, so an older state arriving late
+never replaces a newer one. Each uvicorn worker has its own coalescer;
+SyncedVersions records what has been written so a worker never writes a
+state older than one another worker already synced.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# (record key, mapped record, UpdatedAt or None)
+WebhookEntry = Tuple[Hashable, Dict, Optional[datetime]]
+
+
+@dataclass
+class _PendingRecord:
+    record: Dict
+    version: Optional[datetime]
+    first_seen: float
+    last_seen: float
+
+
+def is_older(version: Optional[datetime], than: Optional[datetime]) -> bool:
+    """True when both versions are known and `version` predates `than`"""
+    return version is not None and than is not None and version < than
+
+
+class WebhookCoalescer:
+    """Keeps the latest state per record and flushes quiet records in bulk"""
+
+    def __init__(
+        self,
+        flush_fn: Callable[[str, List[WebhookEntry]], Awaitable[None]],
+        debounce_ms: float = 1500.0,
+        max_delay_ms: float = 10000.0,
+    ):
+        self.flush_fn = flush_fn
+        self.debounce = max(0.0, debounce_ms) / 1000
+        self.max_delay = max(self.debounce, max_delay_ms / 1000)
+        self._pending: Dict[Tuple[str, Hashable], _PendingRecord] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.received = 0
+        self.coalesced = 0
+        self.stale = 0
+        self.flushed = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, kind: str, key: Hashable, record: Dict, version: Optional[datetime] = None) -> None:
+        """Record the latest state of one row, replacing any older pending state"""
+        now = time.monotonic()
+        self.received += 1
+        previous = self._pending.get((kind, key))
+        if previous is not None:
+            if is_older(version, previous.version):
+                # Delivered out of order: the pending state is newer
+                self.stale += 1
+                return
+            self.coalesced += 1
+        first_seen = previous.first_seen if previous else now
+        self._pending[(kind, key)] = _PendingRecord(record, version, first_seen, now)
+        self._schedule(self.debounce)
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        """Forget a pending record (e.g. the row was deleted)"""
+        self._pending.pop((kind, key), None)
+
+    def _due_at(self, entry: _PendingRecord) -> float:
+        return min(entry.last_seen + self.debounce, entry.first_seen + self.max_delay)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._tick)
+
+    def _tick(self) -> None:
+        self._timer = None
+        now = time.monotonic()
+
+        due: Dict[str, List[WebhookEntry]] = {}
+        for (kind, key), entry in list(self._pending.items()):
+            if self._due_at(entry) <= now:
+                del self._pending[(kind, key)]
+                due.setdefault(kind, []).append((key, entry.record, entry.version))
+
+        for kind, records in due.items():
+            self.flushed += len(records)
+            task = asyncio.get_running_loop().create_task(self._run(kind, records))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._pending:
+            next_due = min(self._due_at(entry) for entry in self._pending.values())
+            self._schedule(max(0.0, next_due - now))
+
+    async def _run(self, kind: str, entries: List[WebhookEntry]) -> None:
+        try:
+            await self.flush_fn(kind, entries)
+        except Exception as e:
+            logger.error(f"Webhook flush of {len(entries)} {kind} failed: {e}")
+
+
+class SyncedVersions:
+    """
+    UpdatedAt of the last state written to Odoo per NocoDB record, shared by
+    the workers on this host through a JSON file per table kind (in memory
+    when there is no shared directory). Callers hold the kind's sync lock.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._memory: Dict[str, Dict[str, str]] = {}
+
+    def _path(self, kind: str) -> str:
+        return os.path.join(self.directory, f"nocodb-{kind}-versions.json")
+
+    def load(self, kind: str) -> Dict[str, datetime]:
+        if self.directory is None:
+            raw = self._memory.get(kind, {})
+        else:
+            try:
+                with open(self._path(kind)) as f:
+                    raw = json.load(f)
+            except FileNotFoundError:
+                raw = {}
+            except ValueError as e:
+                logger.warning(f"Discarding unreadable {kind} sync versions: {e}")
+                raw = {}
+        return {key: datetime.fromisoformat(value) for key, value in raw.items()}
+
+    def save(self, kind: str, versions: Dict[str, datetime]) -> None:
+        raw = {key: value.isoformat() for key, value in versions.items()}
+        if self.directory is None:
+            self._memory[kind] = raw
+            return
+        path = self._path(kind)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(raw, f)
+        os.replace(f"{path}.tmp", path)